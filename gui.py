@@ -1,21 +1,42 @@
 ﻿import os
 import re
 import sys
-import subprocess
+import codecs
+import locale
+import queue
+import threading
 import json
+import time
+import html
 import hashlib
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Sequence
+
+# orjson 为可选依赖，未安装时退回标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from PyQt5.QtCore import (
     Qt,
-    QThread,
+    QObject,
+    QProcess,
+    QProcessEnvironment,
+    QRunnable,
+    QThreadPool,
+    QTimer,
     pyqtSignal,
     QSize,
     QPoint,
 )
 from PyQt5.QtGui import (
+    QBrush,
+    QPainter,
     QPixmap,
-    QMovie,
+    QTextCursor,
+    QTextDocument,
     QIcon,
     QPalette,
     QColor,
@@ -32,7 +53,9 @@ from PyQt5.QtWidgets import (
     QComboBox,
     QListWidget,
     QListWidgetItem,
-    QTextEdit,
+    QTextBrowser,
+    QPlainTextEdit,
+    QPlainTextDocumentLayout,
     QPushButton,
     QCheckBox,
     QSpinBox,
@@ -40,12 +63,14 @@ from PyQt5.QtWidgets import (
     QTableWidgetItem,
     QHeaderView,
     QAbstractItemView,
+    QStyledItemDelegate,
     QSizePolicy,
-    QFrame,
     QSplitter,
-    QScrollArea,
-    QGridLayout,
+    QProgressBar,
 )
+
+from logging_config import LOG_FILE_ENV, flush_logging
+
 # ==== Packaging-aware path helpers ====
 def is_frozen() -> bool:
     return hasattr(sys, "_MEIPASS") or getattr(sys, "frozen", False)
@@ -54,6 +79,8 @@ def resource_path(*paths: str) -> str:
     base = getattr(sys, "_MEIPASS", os.path.dirname(__file__))
     return os.path.join(base, *paths)
 
+# 以下目录在运行期间不变，首次调用时确定（并创建目录），之后直接返回缓存结果
+@lru_cache(maxsize=None)
 def _app_base_dir() -> str:
     # Windows LOCALAPPDATA; fallback to user home
     base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
@@ -62,22 +89,96 @@ def _app_base_dir() -> str:
     os.makedirs(os.path.join(root, "collect"), exist_ok=True)
     return root
 
+@lru_cache(maxsize=None)
 def app_logs_dir() -> str:
     return os.path.join(_app_base_dir(), "logs")
 
+@lru_cache(maxsize=None)
 def app_collect_dir() -> str:
     return os.path.join(_app_base_dir(), "collect")
 
+_DIGITS_RE = re.compile(r"(\d+)")
+
+
+def _natural_key(name: str) -> tuple:
+    """Sort key treating digit runs as numbers, so ``2.log`` sorts before ``10.log``."""
+    return tuple(int(p) if p.isdigit() else p for p in _DIGITS_RE.split(name))
+
+
+def _list_logs(logs_dir: str) -> List[str]:
+    """Return the names of ``.log`` files in *logs_dir*, newest first.
+
+    Log names carry their start time (see :func:`_new_log_path`), so they
+    are ordered by name alone. The order then only changes when files are
+    added or removed, which also changes the directory mtime that
+    :meth:`StarRailwayGUI.refresh_log_list` caches on.
+    """
+    with os.scandir(logs_dir) as it:
+        names = [e.name for e in it if e.name.endswith(".log") and e.is_file()]
+    names.sort(key=_natural_key, reverse=True)
+    return names
+
+
+def _latest_log(logs_dir: str) -> "os.DirEntry | None":
+    """Return the most recently modified ``.log`` entry in *logs_dir*, if any."""
+    with os.scandir(logs_dir) as it:
+        return max(
+            (e for e in it if e.name.endswith(".log") and e.is_file()),
+            key=lambda e: e.stat().st_mtime,
+            default=None,
+        )
+
+
+def _new_log_path(logs_dir: str) -> str:
+    """Return a fresh ``star_resonance_<timestamp>.log`` path for the next solver run."""
+    # 求解器按给定路径直接打开日志，不再创建目录；目录可能在运行期间被删除，每次都确保存在
+    os.makedirs(logs_dir, exist_ok=True)
+    base = time.strftime("star_resonance_%Y%m%d_%H%M%S")
+    path = os.path.join(logs_dir, base + ".log")
+    n = 2
+    # 同一秒内多次求解时追加序号，避免写进上一次的日志
+    while os.path.exists(path):
+        path = os.path.join(logs_dir, f"{base}_{n}.log")
+        n += 1
+    return path
+
 SCRIPT_NAME = os.path.join(os.path.dirname(__file__), "star_railway_monitor.py")
 
 BACKGROUND_IMAGE = resource_path("assets", "gui_bg_80pct.jpg")
 
-ATTRIBUTES = [
+
+@lru_cache(maxsize=1)
+def load_background_pixmap() -> QPixmap | None:
+    """Load :data:`BACKGROUND_IMAGE`, preferring a pre-decoded on-disk cache.
+
+    The first start decodes the JPEG and saves it as an uncompressed BMP in
+    the app directory, named after a hash of the image bytes; later starts
+    load that copy. The name does not depend on file times, because the
+    onefile build extracts the image afresh on every launch. The pixmap is
+    loaded once per process; call only after the QApplication exists.
+    """
+    try:
+        with open(BACKGROUND_IMAGE, "rb") as f:
+            digest = hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+    except OSError:
+        return None
+    cache = os.path.join(_app_base_dir(), f"bg_cache_{digest}.bmp")
+    if os.path.exists(cache):
+        pix = QPixmap(cache)
+        if not pix.isNull():
+            return pix
+    pix = QPixmap(BACKGROUND_IMAGE)
+    if not pix.isNull():
+        pix.save(cache, "BMP")
+    return pix
+
+ATTRIBUTES = (
     "力量加持", "敏捷加持", "智力加持", "特攻伤害", "精英打击", "特攻治疗加持", "专精治疗加持",
     "施法专注", "攻速专注", "暴击专注", "幸运专注", "抵御魔法", "抵御物理",
     "极-绝境守护", "极-伤害叠加", "极-灵活身法", "极-生命凝聚", "极-急救措施",
     "极-生命波动", "极-生命汲取", "极-全队幸暴",
-]
+)
+ATTRIBUTES_SET = frozenset(ATTRIBUTES)
 
 CATEGORIES = {
     "全部": "全部",
@@ -88,63 +189,264 @@ CATEGORIES = {
 
 MATCH_COUNTS = [1, 2, 3]
 
+# SR_OPAQUE=1 时结果/输出窗口使用系统边框和不透明背景，避免半透明窗口的合成开销
+OPAQUE_UI = os.environ.get("SR_OPAQUE", "0") == "1"
+
+# 共享的颜色/画刷，只构造一次
+_COLORS = {
+    "transparent": QColor(0, 0, 0, 0),
+    "white": QColor(255, 255, 255),
+    "base": QColor(0, 0, 0, 150),
+    "alternate_base": QColor(0, 0, 0, 100),
+    "highlight": QColor(0, 120, 215, 180),
+    "dimmer": QColor(0, 0, 0, 128),
+}
+_BRUSHES = {name: QBrush(color) for name, color in _COLORS.items()}
+
+# ResultWindow 中搭配卡片的富文本样式
+RESULT_CARD_CSS = (
+    "td.card { background-color: rgba(0, 0, 0, 0.7); color: white; font-size: 22px; }"
+    "td.rank { font-weight: bold; font-size: 24px; }"
+    "a.star { color: white; text-decoration: none; font-size: 28px; }"
+    "a.star-on { color: yellow; text-decoration: none; font-size: 28px; }"
+)
+# ResultWindow 每批渲染的搭配数量（两列排布，应为偶数）
+RESULT_BATCH_SIZE = 20
+
+
+@lru_cache(maxsize=1)
+def _attr_model() -> QStandardItemModel:
+    """Return the shared read-only model listing :data:`ATTRIBUTES`.
+
+    Built on first use (a QApplication must exist by then) and shared by
+    every per-row attribute combobox in the min-attr-sum table.
+    """
+    model = QStandardItemModel()
+    model.invisibleRootItem().appendRows([QStandardItem(attr) for attr in ATTRIBUTES])
+    return model
+
+# 界面端合并输出文本的刷新间隔（毫秒）
+OUTPUT_FLUSH_MS = 50
+# 输出框最多保留的行数，超出后 Qt 会自动丢弃最早的行（完整内容见日志文件）
+MAX_OUTPUT_BLOCKS = 5000
+# 点击日志时最多读取的字节数，超出只显示末尾部分
+LOG_VIEW_MAX_BYTES = 2 * 1024 * 1024
+# 输出查看窗口最多保留的行数
+OUTPUT_WINDOW_MAX_BLOCKS = 200000
+# 求解结束后解析日志时只读取末尾的字节数（结果位于日志末尾）
+LOG_TAIL_BYTES = 256 * 1024
+
+
+_COMBO_PREFIX = "=== 第"
+_COMBO_SUFFIX = "名搭配 ==="
+_EQ50 = "=" * 50
+_RESULT_HEADER = "模组搭配优化 -"
+_SKIP_PREFIXES = (_EQ50, _RESULT_HEADER)
+
 
 def parse_log_file(path: str) -> List[dict]:
     """Parse a solver log file and extract combination information."""
-    combos: List[dict] = []
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-            lines: List[str] = []
-            for line in fh:
-                stripped = line.strip()
-                if stripped.startswith("=" * 50) or stripped.startswith("模组搭配优化 -"):
-                    continue
-                if stripped.startswith("统计信息"):
-                    break
-                if stripped:
-                    lines.append(stripped)
-        text = "\n".join(lines)
-        pattern = r"=== 第(\d+)名搭配 ==="
-        parts = re.split(pattern, text)
-        for i in range(1, len(parts), 2):
-            rank = int(parts[i])
-            block = parts[i + 1]
-            combo = _parse_block(block)
-            combo["rank"] = rank
-            combos.append(combo)
+        with open(path, "r", encoding="utf-8", errors="ignore", buffering=1 << 16) as fh:
+            return _parse_lines(fh)
     except Exception:
         return []
-    return combos
 
 
-def _parse_block(block: str) -> dict:
-    """Parse a single combination block."""
-    total = ""
-    power = ""
-    modules: List[str] = []
-    attrs: List[str] = []
-    lines = [l for l in block.splitlines() if l.strip()]
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        if line.startswith("总属性值"):
-            total = line
+def _read_log_tail(path: str, nbytes: int = LOG_TAIL_BYTES) -> str:
+    """Return the end of a solver log that still contains the whole result section.
+
+    Only the last *nbytes* are read; if the result header is not inside
+    that window the whole file is read instead, so no combo is lost.
+    """
+    with open(path, "rb") as fh:
+        size = fh.seek(0, os.SEEK_END)
+        if size > nbytes:
+            fh.seek(size - nbytes)
+            data = fh.read()
+            # 丢掉被截断的首行
+            data = data[data.find(b"\n") + 1:]
+            text = data.decode("utf-8", errors="ignore")
+            if _RESULT_HEADER in text:
+                return text
+        fh.seek(0)
+        return fh.read().decode("utf-8", errors="ignore")
+
+
+@lru_cache(maxsize=32)
+def _parse_log_cached(path: str, mtime_ns: int, size: int) -> List[dict]:
+    """Parse the result section of a log, memoized by ``(path, mtime_ns, size)``.
+
+    The returned list and combo dicts are shared between callers. Their
+    parsed data must not be modified; the memo fields in
+    :data:`_DERIVED_KEYS` are deliberately filled in on these shared dicts,
+    since they depend only on the combo itself.
+    """
+    return parse_log_text(_read_log_tail(path))
+
+
+@lru_cache(maxsize=8)
+def _load_log_view(path: str, mtime_ns: int, size: int) -> str:
+    """Return the text shown for a log in the viewer, memoized like :func:`_parse_log_cached`."""
+    with open(path, "rb") as f:
+        truncated = size > LOG_VIEW_MAX_BYTES
+        if truncated:
+            f.seek(size - LOG_VIEW_MAX_BYTES)
+        data = f.read(LOG_VIEW_MAX_BYTES)
+    content = data.decode("utf-8", errors="ignore")
+    if truncated:
+        # 丢掉被截断的首行
+        content = "… (truncated)\n" + content[content.find("\n") + 1:]
+    return content
+
+
+def parse_log_text(text: str) -> List[dict]:
+    """Parse the text of a solver log and extract combination information."""
+    try:
+        return _parse_lines(text.split("\n"))
+    except Exception:
+        return []
+
+
+# _parse_lines 的状态：首个搭配之前 / 搭配头部 / 模组列表 / 属性分布
+_SKIP, _HEADER, _MODULES, _ATTRS = range(4)
+
+
+def _parse_lines(lines: Iterable[str]) -> List[dict]:
+    """Build combos from log lines in a single streaming pass.
+
+    Each line is classified once and written straight into the current
+    combo dict; nothing is joined or split again.
+    """
+    combos: List[dict] = []
+    combo: dict | None = None
+    state = _SKIP
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(_SKIP_PREFIXES):
+            continue
+        if line.startswith("统计信息"):
+            break
+        if line.startswith(_COMBO_PREFIX) and line.endswith(_COMBO_SUFFIX):
+            head = line[len(_COMBO_PREFIX):-len(_COMBO_SUFFIX)]
+            if head.isdigit():
+                if combo is not None:
+                    _finish_combo(combo)
+                    combos.append(combo)
+                combo = {"total": "", "power": "", "modules": [], "attrs": [], "rank": int(head)}
+                state = _HEADER
+                continue
+        if state == _SKIP:
+            continue
+        if state == _ATTRS:
+            combo["attrs"].append(line)
+        elif state == _MODULES:
+            if line.startswith("属性分布"):
+                state = _ATTRS
+            else:
+                combo["modules"].append(line)
+        elif line.startswith("总属性值"):
+            combo["total"] = line
         elif line.startswith("战斗力"):
-            power = line
+            combo["power"] = line
         elif line.startswith("模组列表"):
-            i += 1
-            while i < len(lines) and not lines[i].startswith("属性分布"):
-                modules.append(lines[i].strip())
-                i += 1
-            continue
+            state = _MODULES
         elif line.startswith("属性分布"):
-            i += 1
-            while i < len(lines):
-                attrs.append(lines[i].strip())
-                i += 1
-            break
-        i += 1
-    return {"total": total, "power": power, "modules": modules, "attrs": attrs}
+            state = _ATTRS
+    if combo is not None:
+        _finish_combo(combo)
+        combos.append(combo)
+    return combos
+
+
+def _finish_combo(combo: dict) -> None:
+    """Attach the derived display text to a fully parsed combo."""
+    combo["rendered"] = render_combo_text(combo)
+
+
+def render_combo_text(combo: dict) -> str:
+    """Return the multi-line text shown for *combo* in the result window."""
+    lines: List[str] = []
+    if combo.get("total"):
+        lines.append(combo["total"])
+    if combo.get("power"):
+        lines.append(combo["power"])
+    if combo.get("modules"):
+        lines.append("模组列表:")
+        lines.extend(combo["modules"])
+    if combo.get("attrs"):
+        lines.append("属性分布:")
+        lines.extend(combo["attrs"])
+    return "\n".join(lines)
+
+
+# 解析或显示时附加到搭配上的派生字段，不参与哈希也不写入收藏文件
+# 由搭配自身内容推导出的备忘字段，可直接写入缓存中共享的搭配；保存和计算哈希时去掉
+_DERIVED_KEYS = ("rendered", "_hash", "_html")
+
+
+def _combo_payload(combo: dict) -> dict:
+    """Return *combo* without derived keys, as hashed and saved to the collect dir."""
+    if not any(k in combo for k in _DERIVED_KEYS):
+        return combo
+    return {k: v for k, v in combo.items() if k not in _DERIVED_KEYS}
+
+
+def _combo_key(combo: dict) -> str:
+    """Return the collect file stem of *combo*, computed once and cached on the dict.
+
+    The digest stays md5 over the same JSON as before so existing collect
+    files keep matching their combos.
+    """
+    key = combo.get("_hash")
+    if key is None:
+        key = hashlib.md5(
+            json.dumps(_combo_payload(combo), sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        combo["_hash"] = key
+    return key
+
+
+def _collected_keys(collect_dir: str) -> set[str]:
+    """Return the hashes of all combos saved in *collect_dir* (one listing, no per-file stat)."""
+    try:
+        with os.scandir(collect_dir) as it:
+            return {e.name[:-5] for e in it if e.name.endswith(".json")}
+    except OSError:
+        return set()
+
+
+def _dump_combo_json(payload: dict) -> bytes:
+    """Serialize a combo for the collect dir as indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _load_collected_file(path: str) -> dict | None:
+    """Load one saved combo, or ``None`` if the file cannot be read."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        combo = orjson.loads(data) if orjson is not None else json.loads(data)
+        # 与解析日志得到的搭配一样，在后台线程中预先拼好显示文本
+        _finish_combo(combo)
+        return combo
+    except Exception:
+        return None
+
+
+def _load_collected(collect_dir: str) -> List[dict]:
+    """Load every combo saved in *collect_dir*, reading the files in parallel."""
+    try:
+        with os.scandir(collect_dir) as it:
+            paths = [e.path for e in it if e.name.endswith(".json")]
+    except OSError:
+        return []
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(paths))) as ex:
+        return [c for c in ex.map(_load_collected_file, paths) if c is not None]
 
 
 class CheckableComboBox(QComboBox):
@@ -165,128 +467,362 @@ class CheckableComboBox(QComboBox):
         if self.lineEdit() is not None:
             self.lineEdit().setReadOnly(True)        
         self._placeholder_text = "请选择"
+        # 已勾选项按勾选顺序记录（dict 保持插入顺序），避免每次点击都遍历整个模型
+        self._checked: dict[str, None] = {}
+        # 连续点击合并为一次显示文本刷新
+        self._update_pending = False
+        self._update_timer = QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(0)
+        self._update_timer.timeout.connect(self._do_update_display_text)
         self.setSizeAdjustPolicy(QComboBox.AdjustToContents)
 
-    def add_check_item(self, text: str):
-        """Add a new checkable item to the combobox."""
-        item = QStandardItem(text)
-        item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
-        item.setData(Qt.Unchecked, Qt.CheckStateRole)
-        self.model().appendRow(item)
+    def populate_check_items(self, texts: Sequence[str]):
+        """Replace all items with *texts*, unchecked.
+
+        The rows are inserted into a fresh model before it is attached, so
+        the view sees one model reset instead of a signal per row.
+        """
+        model = QStandardItemModel(self)
+        items = []
+        for text in texts:
+            item = QStandardItem(text)
+            item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
+            item.setData(Qt.Unchecked, Qt.CheckStateRole)
+            items.append(item)
+        model.invisibleRootItem().appendRows(items)
+        # 旧模型以本控件为父对象，setModel 时由 Qt 删除
+        self.setModel(model)
+        self._checked.clear()
         self.update_display_text()
 
     def handle_item_pressed(self, index):
         """Toggle the check state of the clicked item."""
         item = self.model().itemFromIndex(index)
+        text = item.text()
         if item.checkState() == Qt.Checked:
             item.setCheckState(Qt.Unchecked)
+            self._checked.pop(text, None)
         else:
             item.setCheckState(Qt.Checked)
+            self._checked[text] = None
+        if not self._update_pending:
+            self._update_pending = True
+            self._update_timer.start()
+
+    def _do_update_display_text(self):
+        """Run the display text update scheduled by :meth:`handle_item_pressed`."""
+        self._update_pending = False
         self.update_display_text()
 
     def update_display_text(self):
         """Update the combobox text based on checked items."""
-        checked = self.checked_items()
-        if checked:
-            self.setEditText(", ".join(checked))
-        else:
-            self.setEditText(self._placeholder_text)
+        self.setEditText(", ".join(self._checked) or self._placeholder_text)
 
     def checked_items(self) -> List[str]:
-        """Return a list of all currently checked item texts."""
-        checked = []
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            if item.checkState() == Qt.Checked:
-                checked.append(item.text())
-        return checked
+        """Return a list of all currently checked item texts, in check order."""
+        return list(self._checked)
 
     def clear_checked(self):
         """Clear all checkboxes."""
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            item.setCheckState(Qt.Unchecked)
+        if self._checked:
+            model = self.model()
+            for i in range(model.rowCount()):
+                item = model.item(i)
+                if item.text() in self._checked:
+                    item.setCheckState(Qt.Unchecked)
+            self._checked.clear()
         self.update_display_text()
 
 
-class SolverWorker(QThread):
-    """运行求解器脚本并输出其结果的工作线程。
-    接收命令行参数列表，并以此参数启动子进程运行``python star_railway_monitor.py``。
-    通过:attr:`output_signal`输出。
-    进程完成时触发:attr:`finished_signal`。
-    """
+class AttrDelegate(QStyledItemDelegate):
+    """Edit a min-attr-sum attribute cell with a combobox created on demand."""
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.setModel(_attr_model())
+        return combo
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data() or "")
 
-    output_signal = pyqtSignal(str)
-    finished_signal = pyqtSignal()
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText())
 
-    def __init__(self, args: List[str], parent=None):
+
+class CountDelegate(QStyledItemDelegate):
+    """Edit a min-attr-sum count cell with a spinbox created on demand."""
+
+    def createEditor(self, parent, option, index):
+        spin = QSpinBox(parent)
+        spin.setMinimum(1)
+        spin.setMaximum(999)
+        return spin
+
+    def setEditorData(self, editor, index):
+        try:
+            editor.setValue(int(index.data()))
+        except (TypeError, ValueError):
+            editor.setValue(1)
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, str(editor.value()))
+
+
+class SolverWorker(QObject):
+    """运行求解器脚本并收集其输出。
+    接收命令行参数列表：开发环境下通过 :class:`QProcess` 运行``python star_railway_monitor.py``，
+    输出由 Qt 事件循环直接送达，无需额外的读取线程；打包环境下在后台线程中直接调用求解器。
+    求解器的日志写入 ``log_path``（通过 :data:`LOG_FILE_ENV` 传递）。
+    子进程输出以原始字节、内部消息以文本放入:attr:`output_queue`，由界面端定时取出。
+    运行完成时放入 ``None`` 作为结束标记。
+    """
+
+    def __init__(self, args: List[str], log_path: str, parent: QObject | None = None):
         super().__init__(parent)
         self.args = args
+        self.log_path = log_path
+        self.output_queue: "queue.SimpleQueue[bytes | str | None]" = queue.SimpleQueue()
+        self._process: QProcess | None = None
 
-    def run(self):
+    def _emit(self, text: str) -> None:
+        self.output_queue.put(text)
+
+    def start(self) -> None:
+        """Start the solver; output arrives in :attr:`output_queue`."""
+        if is_frozen():
+            threading.Thread(target=self._run_inline, daemon=True).start()
+        else:
+            self._start_process()
+
+    def _run_inline(self) -> None:
         try:
-            if is_frozen():
-                # Frozen: call solver inline
-                old_cwd = os.getcwd()
-                os.chdir(_app_base_dir())
+            # Frozen: call solver inline
+            old_cwd = os.getcwd()
+            os.chdir(_app_base_dir())
+            try:
+                import logging
+                import importlib
+                # set up logger handler to forward to GUI
+                class GuiQueueHandler(logging.Handler):
+                    def emit(inner, record):
+                        msg = inner.format(record)
+                        self._emit(msg + "\n")
+                handler = GuiQueueHandler()
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                root = logging.getLogger()
+                root.addHandler(handler)
+                root.setLevel(logging.INFO)
+
+                # ensure module import works whether bundled or not
                 try:
-                    import logging
-                    import importlib
-                    # set up logger handler to forward to GUI
-                    class QtSignalHandler(logging.Handler):
-                        def emit(inner, record):
-                            msg = inner.format(record)
-                            self.output_signal.emit(msg + "\n")
-                    handler = QtSignalHandler()
-                    handler.setFormatter(logging.Formatter("%(message)s"))
-                    root = logging.getLogger()
-                    root.addHandler(handler)
-                    root.setLevel(logging.INFO)
-
-                    # ensure module import works whether bundled or not
-                    try:
-                        import star_railway_monitor as srm
-                    except Exception as ie:
-                        self.output_signal.emit(f"导入 star_railway_monitor 失败: {ie}\\n")
-                        return
-
-                    old_argv = sys.argv[:]
-                    try:
-                        sys.argv = ["star_railway_monitor.py"] + self.args
-                        if hasattr(srm, "main"):
-                            srm.main()
+                    import star_railway_monitor as srm
+                except Exception as ie:
+                    self._emit(f"导入 star_railway_monitor 失败: {ie}\\n")
+                    return
+
+                old_argv = sys.argv[:]
+                old_log_file = os.environ.get(LOG_FILE_ENV)
+                os.environ[LOG_FILE_ENV] = self.log_path
+                try:
+                    sys.argv = ["star_railway_monitor.py"] + self.args
+                    if hasattr(srm, "main"):
+                        srm.main()
+                    else:
+                        # 猜测入口：如果没有 main，退回到解析器
+                        if hasattr(srm, "run"):
+                            srm.run()
                         else:
-                            # 猜测入口：如果没有 main，退回到解析器
-                            if hasattr(srm, "run"):
-                                srm.run()
-                            else:
-                                self.output_signal.emit("未找到 star_railway_monitor 的入口函数(main/run)。\\n")
-                    finally:
-                        sys.argv = old_argv
-                        root.removeHandler(handler)
+                            self._emit("未找到 star_railway_monitor 的入口函数(main/run)。\\n")
                 finally:
-                    os.chdir(old_cwd)
-            else:
-                # Dev: spawn python process, unify CWD to writable app dir so logs go to the same place
-                cmd = [sys.executable, SCRIPT_NAME] + self.args
-                print("RUN:", " ".join(cmd))
-                process = subprocess.Popen(
-                    cmd,
-                    cwd=_app_base_dir(),
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                )
-                if process.stdout:
-                    for line in process.stdout:
-                        self.output_signal.emit(line)
-                process.wait()
+                    # 日志经队列和写缓冲异步写出，界面随后要解析日志文件，先全部写盘
+                    flush_logging()
+                    sys.argv = old_argv
+                    if old_log_file is None:
+                        os.environ.pop(LOG_FILE_ENV, None)
+                    else:
+                        os.environ[LOG_FILE_ENV] = old_log_file
+                    root.removeHandler(handler)
+            finally:
+                os.chdir(old_cwd)
         except Exception as e:
-            self.output_signal.emit(f"Error running solver: {e}\\n")
+            self._emit(f"Error running solver: {e}\\n")
         finally:
-            self.finished_signal.emit()
+            self.output_queue.put(None)
+
+    def _start_process(self) -> None:
+        # Dev: spawn python process, unify CWD to writable app dir so logs go to the same place
+        cmd = [sys.executable, SCRIPT_NAME] + self.args
+        print("RUN:", " ".join(cmd))
+        env = QProcessEnvironment.systemEnvironment()
+        env.insert(LOG_FILE_ENV, self.log_path)
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        process.setWorkingDirectory(_app_base_dir())
+        process.setProcessEnvironment(env)
+        process.readyReadStandardOutput.connect(self._on_ready_read)
+        process.finished.connect(self._on_process_finished)
+        process.errorOccurred.connect(self._on_process_error)
+        self._process = process
+        process.start(cmd[0], cmd[1:])
+
+    def _on_ready_read(self) -> None:
+        """一次取出子进程已缓冲的全部输出，原样把字节放入队列，由界面端统一解码。"""
+        data = bytes(self._process.readAllStandardOutput())
+        if data:
+            self.output_queue.put(data)
+
+    def _on_process_finished(self, exit_code: int, exit_status) -> None:
+        self._on_ready_read()
+        self.output_queue.put(None)
+
+    def _on_process_error(self, error) -> None:
+        # 启动失败时不会再有 finished 信号，需要自行放入结束标记
+        if error == QProcess.FailedToStart:
+            self._emit(f"Error running solver: {self._process.errorString()}\n")
+            self.output_queue.put(None)
+
+
+class _ParseSignals(QObject):
+    finished = pyqtSignal(int, object, object)
+    failed = pyqtSignal(int, str)
+
+
+class _ParseTask(QRunnable):
+    """在线程池中解析日志末尾，结果通过 :attr:`signals` 回到界面线程。
+    信号带上创建任务时的 ``generation``，界面端据此忽略已被新任务取代的结果。
+    """
+
+    def __init__(self, key: tuple, generation: int):
+        super().__init__()
+        self.key = key
+        self.generation = generation
+        self.signals = _ParseSignals()
+
+    def run(self):
+        try:
+            combos = _parse_log_cached(*self.key)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, self.key, combos)
+
+
+class _CollectLoadSignals(QObject):
+    loaded = pyqtSignal(str, object)
+    failed = pyqtSignal(str)
+
+
+class _CollectLoadTask(QRunnable):
+    """在线程池中读取收藏夹，结果通过 :attr:`signals` 回到界面线程。"""
+
+    def __init__(self, collect_dir: str):
+        super().__init__()
+        self.collect_dir = collect_dir
+        self.signals = _CollectLoadSignals()
+
+    def run(self):
+        try:
+            combos = _load_collected(self.collect_dir)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.loaded.emit(self.collect_dir, combos)
+
+
+class _CollectWriteSignals(QObject):
+    done = pyqtSignal(str, bool)
+
+
+class _CollectWriteTask(QRunnable):
+    """在线程池中写入或删除一个收藏文件；``payload`` 为 ``None`` 表示删除。"""
+
+    def __init__(self, key: str, path: str, payload: dict | None):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.payload = payload
+        self.signals = _CollectWriteSignals()
+
+    def run(self):
+        try:
+            if self.payload is None:
+                try:
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+            else:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                data = _dump_combo_json(self.payload)
+                # 先写临时文件再原子替换，收藏目录中不会出现写了一半的 JSON
+                tmp = self.path + ".tmp"
+                try:
+                    with open(tmp, "wb") as f:
+                        f.write(data)
+                    os.replace(tmp, self.path)
+                except BaseException:
+                    try:
+                        os.remove(tmp)
+                    except OSError:
+                        pass
+                    raise
+        except Exception:
+            self.signals.done.emit(self.key, False)
+            return
+        self.signals.done.emit(self.key, True)
+
+
+class BackgroundWidget(QWidget):
+    """
+    直接绘制背景图的中心控件，背景图只解码一次并按窗口大小缓存缩放结果。
+    """
+
+    def __init__(self, pixmap: QPixmap | None, parent=None):
+        super().__init__(parent)
+        self._pix = pixmap if pixmap is not None and not pixmap.isNull() else None
+        self._scaled: QPixmap | None = None
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._pix is not None:
+            self._scaled = self._pix.scaled(
+                self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation
+            )
+
+    def paintEvent(self, event):
+        if self._scaled is not None:
+            painter = QPainter(self)
+            x = (self.width() - self._scaled.width()) // 2
+            y = (self.height() - self._scaled.height()) // 2
+            painter.drawPixmap(x, y, self._scaled)
+            painter.end()
+
+
+class DimmerWidget(QWidget):
+    """
+    半透明黑色遮罩，直接在 paintEvent 中填充，不经过样式表。
+    """
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), _BRUSHES["dimmer"])
+        painter.end()
+
+
+# 标题栏样式在每个窗口中都相同，只构造一次
+_TITLE_BAR_STYLE = "background-color: rgba(0, 0, 0, 0.4); color: white;"
+_TITLE_LABEL_STYLE = "font-weight: bold; font-size: 18px;"
+_MINIMISE_BUTTON_STYLE = (
+    "QPushButton {background-color: transparent; color: white; border: none; font-size: 20px;}"
+    "QPushButton:hover {background-color: rgba(255, 255, 255, 0.2);}"
+)
+_CLOSE_BUTTON_STYLE = (
+    "QPushButton {background-color: transparent; color: white; border: none; font-size: 20px;}"
+    "QPushButton:hover {background-color: rgba(255, 0, 0, 0.5);}"
+)
+
+
 class CustomTitleBar(QWidget):
     """
     实现最小化和关闭按钮的自定义标题栏。
@@ -305,7 +841,7 @@ class CustomTitleBar(QWidget):
         layout.setSpacing(10)
 
         self.title_label = QLabel("Star Resonance Auto Mod    原作者：fudiyangjin    GUI作者：Tairitsu-Aya  bilibili@Murasame绫         移动窗口请拖拽本行")
-        self.title_label.setStyleSheet("font-weight: bold; font-size: 18px;")
+        self.title_label.setStyleSheet(_TITLE_LABEL_STYLE)
         self.title_label.setAlignment(Qt.AlignCenter)
 
         spacer = QWidget()
@@ -313,19 +849,13 @@ class CustomTitleBar(QWidget):
 
         self.minimise_button = QPushButton("–")
         self.minimise_button.setFixedSize(28, 28)
-        self.minimise_button.setStyleSheet(
-            "QPushButton {background-color: transparent; color: white; border: none; font-size: 20px;}"
-            "QPushButton:hover {background-color: rgba(255, 255, 255, 0.2);}"
-        )
+        self.minimise_button.setStyleSheet(_MINIMISE_BUTTON_STYLE)
         self.minimise_button.clicked.connect(self.on_minimise)
 
         # Close button
         self.close_button = QPushButton("✕")
         self.close_button.setFixedSize(28, 28)
-        self.close_button.setStyleSheet(
-            "QPushButton {background-color: transparent; color: white; border: none; font-size: 20px;}"
-            "QPushButton:hover {background-color: rgba(255, 0, 0, 0.5);}"
-        )
+        self.close_button.setStyleSheet(_CLOSE_BUTTON_STYLE)
         self.close_button.clicked.connect(self.on_close)
 
         layout.addWidget(self.title_label)
@@ -334,7 +864,7 @@ class CustomTitleBar(QWidget):
         layout.addWidget(self.close_button)
         self.setLayout(layout)
         self.setFixedHeight(35)
-        self.setStyleSheet("background-color: rgba(0, 0, 0, 0.4); color: white;")
+        self.setStyleSheet(_TITLE_BAR_STYLE)
 
     def on_minimise(self):
         if self.parent_window:
@@ -364,6 +894,41 @@ class CustomTitleBar(QWidget):
         super().mouseReleaseEvent(event)
 
 
+# 主窗口样式表，只构造一次
+_MAIN_WINDOW_STYLE = (
+    "* { color: white; font-family: 'Segoe UI', sans-serif; }"
+    "QComboBox, QSpinBox, QTableWidget, QListWidget, QTextEdit, QPlainTextEdit {"
+    " background-color: rgba(0,0,0,0.5);"
+    " border: 1px solid rgba(255,255,255,0.2);"
+    " }"
+    "QPushButton {"
+    " background-color: rgba(255,255,255,0.1);"
+    " border: 1px solid rgba(255,255,255,0.2);"
+    " padding: 4px 8px;"
+    " }"
+    "QPushButton:hover {"
+    " background-color: rgba(255,255,255,0.2);"
+    " }"
+    # 强调按钮通过 kind 属性选择样式，整个窗口只解析这一份样式表
+    "QPushButton[kind=\"accent\"] {"
+    " background-color: rgba(0, 120, 215, 0.8); color: white; border: none; padding: 4px 8px;"
+    " }"
+    "QPushButton[kind=\"solve\"] {"
+    " background-color: rgba(0, 120, 215, 0.8); color: white; font-weight: bold;"
+    " }"
+    "QPushButton[kind=\"accent\"]:hover, QPushButton[kind=\"solve\"]:hover {"
+    " background-color: rgba(0, 120, 215, 1.0);"
+    " }"
+)
+_OUTPUT_EDIT_STYLE = (
+    "background-color: rgba(0, 0, 0, 0.5);"
+    "color: white;"
+    "border: 1px solid rgba(255, 255, 255, 0.2);"
+    "padding: 5px;"
+)
+_LOADING_OVERLAY_STYLE = "background-color: rgba(0, 0, 0, 0.6);"
+
+
 class StarRailwayGUI(QMainWindow):
     """Main application window for the Star Resonance Auto Mod GUI."""
 
@@ -371,8 +936,8 @@ class StarRailwayGUI(QMainWindow):
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
         self.setAttribute(Qt.WA_TranslucentBackground)
-        if os.path.exists(BACKGROUND_IMAGE):
-            pix = QPixmap(BACKGROUND_IMAGE)
+        pix = load_background_pixmap()
+        if pix is not None:
             self._bg_pixmap = pix
             self.resize(pix.width(), pix.height())
         else:
@@ -380,37 +945,47 @@ class StarRailwayGUI(QMainWindow):
             self.resize(1200, 800)
             self._bg_pixmap = None
         self.last_result_combos: List[dict] | None = None
-        # Build UI components
-        self.init_ui()
-
+        # 子窗口只创建一次，之后复用并替换内容
+        self.result_window: ResultWindow | None = None
+        self.collect_window: ResultWindow | None = None
+        self._output_window: OutputWindow | None = None
         # Worker thread placeholder
         self.solver_worker: SolverWorker | None = None
-
-    def paintEvent(self, event):
-        super().paintEvent(event)
+        self._logs_dir = app_logs_dir()
+        # (目录 mtime_ns, 文件名列表)，目录未变化时不再重新扫描
+        self._log_list_cache: tuple[int, List[str]] | None = None
+        # 上次解析结果对应的 (路径, mtime, size)，日志未变化时不再重新解析
+        self._parsed_log_key: tuple[str, int, int] | None = None
+        self._parse_task: _ParseTask | None = None
+        # 每启动一个解析任务加一，只有最新任务的结果会被采用
+        self._parse_generation = 0
+        self._collect_task: _CollectLoadTask | None = None
+        # 最近一次求解写入的日志文件
+        self._solver_log_path: str | None = None
+        # 输出缓冲：求解期间由定时器统一写入输出框
+        self._pending_output: List[str] = []
+        # 子进程输出的增量解码器，每次求解时重建；_output_carry 暂存跨批次的 \r
+        self._output_decoder: codecs.IncrementalDecoder | None = None
+        self._output_carry = ""
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(OUTPUT_FLUSH_MS)
+        self._flush_timer.setSingleShot(False)
+        self._flush_timer.timeout.connect(self._flush_output)
+        # Build UI components
+        self.init_ui()
 
     def init_ui(self):
-        central = QWidget()
+        central = BackgroundWidget(self._bg_pixmap)
         central.setObjectName("central")
         layout = QVBoxLayout()
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(10)
         central.setLayout(layout)
         # 半透明遮罩，降低背景图存在感
-        self.bg_dimmer = QWidget(central)
+        self.bg_dimmer = DimmerWidget(central)
         self.bg_dimmer.setAttribute(Qt.WA_TransparentForMouseEvents)
-        self.bg_dimmer.setStyleSheet("background-color: rgba(0,0,0,0.5);")
         self.bg_dimmer.setGeometry(central.rect())
         self.bg_dimmer.lower()  # 放到其他控件下面（但在背景图之上）
-        if os.path.exists(BACKGROUND_IMAGE):
-            img_path = BACKGROUND_IMAGE.replace("\\", "/")
-            central.setStyleSheet(
-                f"#central {{"
-                f"background-image: url({img_path});"
-                f"background-repeat: no-repeat;"
-                f"background-position: center;"
-                f"}}"
-            )
         
         self.title_bar = CustomTitleBar(self)
         layout.addWidget(self.title_bar)
@@ -450,15 +1025,13 @@ class StarRailwayGUI(QMainWindow):
         self.top_splitter.setStretchFactor(0, 7)
         self.top_splitter.setStretchFactor(1, 3)
         
-        self.output_edit = QTextEdit()
+        self.output_edit = QPlainTextEdit()
         self.output_edit.setReadOnly(True)
-        self.output_edit.setStyleSheet(
-            "background-color: rgba(0, 0, 0, 0.5);"
-            "color: white;"
-            "border: 1px solid rgba(255, 255, 255, 0.2);"
-            "padding: 5px;"
-        )
+        self.output_edit.setStyleSheet(_OUTPUT_EDIT_STYLE)
         self.output_edit.setPlaceholderText("输出内容将在此显示...")
+        self.output_edit.document().setMaximumBlockCount(MAX_OUTPUT_BLOCKS)
+        # 只读输出区无需撤销记录，避免每次插入都分配撤销栈
+        self.output_edit.setUndoRedoEnabled(False)
         
         bottom_container = QWidget()
         bottom_layout = QVBoxLayout()
@@ -472,28 +1045,19 @@ class StarRailwayGUI(QMainWindow):
         
         self.expand_output_button = QPushButton("放大显示")
         self.expand_output_button.setFixedHeight(24)
-        self.expand_output_button.setStyleSheet(
-            "QPushButton { background-color: rgba(0, 120, 215, 0.8); color: white; border: none; padding: 4px 8px; }"
-            "QPushButton:hover { background-color: rgba(0, 120, 215, 1.0); }"
-        )
+        self.expand_output_button.setProperty("kind", "accent")
         self.expand_output_button.clicked.connect(self.show_output_window)
         button_row.addWidget(self.expand_output_button)
         
         self.view_collect_button = QPushButton("查看收藏")
         self.view_collect_button.setFixedHeight(24)
-        self.view_collect_button.setStyleSheet(
-            "QPushButton { background-color: rgba(0, 120, 215, 0.8); color: white; border: none; padding: 4px 8px; }"
-            "QPushButton:hover { background-color: rgba(0, 120, 215, 1.0); }"
-        )
+        self.view_collect_button.setProperty("kind", "accent")
         self.view_collect_button.clicked.connect(self.show_collect_window)
         button_row.addWidget(self.view_collect_button)
         
         self.view_result_button = QPushButton("组合查看")
         self.view_result_button.setFixedHeight(24)
-        self.view_result_button.setStyleSheet(
-            "QPushButton { background-color: rgba(0, 120, 215, 0.8); color: white; border: none; padding: 4px 8px; }"
-            "QPushButton:hover { background-color: rgba(0, 120, 215, 1.0); }"
-        )
+        self.view_result_button.setProperty("kind", "accent")
         self.view_result_button.clicked.connect(self.show_last_result_window)
         button_row.addWidget(self.view_result_button)
         button_row.addStretch(1)
@@ -510,32 +1074,20 @@ class StarRailwayGUI(QMainWindow):
         # Loading animation overlay
         self.loading_label = QLabel(central)
         self.loading_label.setAlignment(Qt.AlignCenter)
-        self.loading_label.setStyleSheet("background-color: rgba(0, 0, 0, 0.6);")
-        self.loading_movie = QMovie()
-        spinner_path = resource_path("assets", "spinner.gif")
-        if os.path.exists(spinner_path):
-            self.loading_movie.setFileName(spinner_path)
-        self.loading_label.setMovie(self.loading_movie)
+        self.loading_label.setStyleSheet(_LOADING_OVERLAY_STYLE)
+        # 不确定进度条由 Qt 原生绘制，比逐帧解码 GIF 省 CPU
+        self.loading_bar = QProgressBar()
+        self.loading_bar.setRange(0, 0)
+        self.loading_bar.setTextVisible(False)
+        self.loading_bar.setFixedWidth(300)
+        loading_layout = QVBoxLayout(self.loading_label)
+        loading_layout.addWidget(self.loading_bar, 0, Qt.AlignCenter)
         self.loading_label.hide()
         # Set the central widget
         self.setCentralWidget(central)
 
         # Set global stylesheet for consistent look
-        self.setStyleSheet(
-            "* { color: white; font-family: 'Segoe UI', sans-serif; }"
-            "QComboBox, QSpinBox, QTableWidget, QListWidget, QTextEdit {"
-            " background-color: rgba(0,0,0,0.5);"
-            " border: 1px solid rgba(255,255,255,0.2);"
-            " }"
-            "QPushButton {"
-            " background-color: rgba(255,255,255,0.1);"
-            " border: 1px solid rgba(255,255,255,0.2);"
-            " padding: 4px 8px;"
-            " }"
-            "QPushButton:hover {"
-            " background-color: rgba(255,255,255,0.2);"
-            " }"
-        )
+        self.setStyleSheet(_MAIN_WINDOW_STYLE)
 
     def resizeEvent(self, event):
         """Update the loading overlay geometry on resize."""
@@ -556,13 +1108,11 @@ class StarRailwayGUI(QMainWindow):
         self.category_combo.setCurrentText("全部")
         attr_label = QLabel("选择词条 (attributes):")
         self.attributes_combo = CheckableComboBox()
-        for attr in ATTRIBUTES:
-            self.attributes_combo.add_check_item(attr)
+        self.attributes_combo.populate_check_items(ATTRIBUTES)
         
         excl_label = QLabel("排除词条 (exclude attributes):")
         self.exclude_combo = CheckableComboBox()
-        for attr in ATTRIBUTES:
-            self.exclude_combo.add_check_item(attr)
+        self.exclude_combo.populate_check_items(ATTRIBUTES)
         
         match_label = QLabel("匹配数量 (match count):")
         self.match_combo = QComboBox()
@@ -592,16 +1142,20 @@ class StarRailwayGUI(QMainWindow):
         self.mas_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.mas_table.verticalHeader().setVisible(False)
         self.mas_table.setSelectionBehavior(QAbstractItemView.SelectRows)
-        self.mas_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # 编辑控件只在编辑当前单元格时由委托创建
+        self.mas_table.setEditTriggers(
+            QAbstractItemView.CurrentChanged
+            | QAbstractItemView.SelectedClicked
+            | QAbstractItemView.DoubleClicked
+        )
+        self.mas_table.setItemDelegateForColumn(0, AttrDelegate(self.mas_table))
+        self.mas_table.setItemDelegateForColumn(1, CountDelegate(self.mas_table))
         # Button to add new row
         self.add_mas_button = QPushButton("添加一行 (Add)")
         self.add_mas_button.clicked.connect(self.add_mas_row)
         # Start solve button
         self.solve_button = QPushButton("开始求解")
-        self.solve_button.setStyleSheet(
-            "QPushButton {background-color: rgba(0, 120, 215, 0.8); color: white; font-weight: bold;}"
-            "QPushButton:hover {background-color: rgba(0, 120, 215, 1.0);}"
-        )
+        self.solve_button.setProperty("kind", "solve")
         self.solve_button.clicked.connect(self.on_solve)
         # Lay out
         parent_layout.addWidget(self.enum_checkbox)
@@ -614,20 +1168,11 @@ class StarRailwayGUI(QMainWindow):
         parent_layout.addLayout(button_row)
 
     def add_mas_row(self):
-        """Append a new row to the min‑attr‑sum table with editable widgets."""
+        """Append a new row to the min‑attr‑sum table; cells are edited via delegates."""
         row = self.mas_table.rowCount()
         self.mas_table.insertRow(row)
-        # Attribute selector combobox for this row
-        combo = QComboBox()
-        for attr in ATTRIBUTES:
-            combo.addItem(attr)
-        self.mas_table.setCellWidget(row, 0, combo)
-        # Quantity spinbox for this row
-        spin = QSpinBox()
-        spin.setMinimum(1)
-        spin.setMaximum(999)
-        spin.setValue(1)
-        self.mas_table.setCellWidget(row, 1, spin)
+        self.mas_table.setItem(row, 0, QTableWidgetItem(ATTRIBUTES[0]))
+        self.mas_table.setItem(row, 1, QTableWidgetItem("1"))
 
     def init_log_panel(self, parent_layout: QVBoxLayout):
         """Initialise the log file panel."""
@@ -641,62 +1186,75 @@ class StarRailwayGUI(QMainWindow):
 
     def refresh_log_list(self):
         """Scan the ``logs`` directory and populate the list widget."""
+        logs_dir = self._logs_dir
+        try:
+            mtime = os.stat(logs_dir).st_mtime_ns
+        except OSError:
+            self._log_list_cache = None
+            self.log_list.clear()
+            return
+        cached = self._log_list_cache
+        # 目录 mtime 未变且列表条目数一致时，列表内容必然没变
+        if cached is not None and cached[0] == mtime and self.log_list.count() == len(cached[1]):
+            return
+        names = _list_logs(logs_dir)
+        if cached is not None and not set(cached[1]).issubset(names):
+            # 有日志被删除，丢掉缓存中对应的内容
+            _parse_log_cached.cache_clear()
+            _load_log_view.cache_clear()
+        self._log_list_cache = (mtime, names)
         self.log_list.clear()
-        logs_dir = app_logs_dir()
-        if os.path.isdir(logs_dir):
-            files = [f for f in os.listdir(logs_dir) if f.endswith(".log")]
-            for fname in sorted(files):
-                item = QListWidgetItem(fname)
-                self.log_list.addItem(item)
+        for fname in names:
+            item = QListWidgetItem(fname)
+            self.log_list.addItem(item)
 
     def on_log_clicked(self, item: QListWidgetItem):
         """Load and display the selected log file in the output area."""
         log_name = item.text()
-        logs_dir = app_logs_dir()
-        path = os.path.join(logs_dir, log_name)
+        path = os.path.join(self._logs_dir, log_name)
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-            self.output_edit.setPlainText(content)
+            st = os.stat(path)
+            self.output_edit.setPlainText(_load_log_view(path, st.st_mtime_ns, st.st_size))
         except Exception as e:
             self.output_edit.setPlainText(f"无法读取日志 {log_name}: {e}\n")
 
     def build_args(self) -> List[str]:
         """Construct command line arguments from current UI state."""
-        args: List[str] = []
+        parts: List[tuple] = [("-a",)]
         # Category
-        cat_text = self.category_combo.currentText()
-        cat_value = CATEGORIES.get(cat_text, None)
-        args.extend(["-a"])
+        cat_value = CATEGORIES.get(self.category_combo.currentText(), None)
         if cat_value and cat_value != "all":
-            args.extend(["--category", cat_value])
+            parts.append(("--category", cat_value))
         # Attributes
         attrs = self.attributes_combo.checked_items()
         if attrs:
-            args.extend(["--attributes", *attrs])
+            parts.append(("--attributes", *attrs))
         # Exclude attributes
         excl_attrs = self.exclude_combo.checked_items()
         if excl_attrs:
-            args.extend(["--exclude-attributes", *excl_attrs])
+            parts.append(("--exclude-attributes", *excl_attrs))
         # Match count
         match_value = self.match_combo.currentText()
         if match_value:
-            args.extend(["--match-count", match_value])
+            parts.append(("--match-count", match_value))
         # Enumeration mode
         if self.enum_checkbox.isChecked():
-            args.append("--enumeration-mode")
+            parts.append(("--enumeration-mode",))
         # Debug mode
         if self.debug_checkbox.isChecked():
-            args.append("--debug")
+            parts.append(("--debug",))
         # Min attr sum rows
+        # 属性单元格只能由 AttrDelegate 从 ATTRIBUTES 中选择，直接按集合校验
+        add = parts.append
+        table_item = self.mas_table.item
         for row in range(self.mas_table.rowCount()):
-            attr_widget = self.mas_table.cellWidget(row, 0)
-            count_widget = self.mas_table.cellWidget(row, 1)
-            if isinstance(attr_widget, QComboBox) and isinstance(count_widget, QSpinBox):
-                attr_name = attr_widget.currentText().strip()
-                count = count_widget.value()
-                if attr_name:
-                    args.extend(["-mas", f"{attr_name}", f"{count}"])
+            attr_item = table_item(row, 0)
+            count_item = table_item(row, 1)
+            if attr_item is not None and count_item is not None:
+                attr_name = attr_item.text()
+                if attr_name in ATTRIBUTES_SET:
+                    add(("-mas", attr_name, count_item.text()))
+        args = [x for grp in parts for x in grp]
         print(args)
         return args
 
@@ -710,80 +1268,183 @@ class StarRailwayGUI(QMainWindow):
         central = self.centralWidget()
         if central:
             self.loading_label.setGeometry(central.rect())
-        if self.loading_movie.fileName():
-            self.loading_movie.start()
         self.loading_label.show()
         
         self.solve_button.setEnabled(False)
         
-        self.solver_worker = SolverWorker(args)
-        self.solver_worker.output_signal.connect(self.append_output)
-        self.solver_worker.finished_signal.connect(self.on_solver_finished)
+        self._solver_log_path = _new_log_path(self._logs_dir)
+        self.solver_worker = SolverWorker(args, self._solver_log_path)
+        # 与原先 text=True 一致，按系统首选编码解码
+        self._output_decoder = codecs.getincrementaldecoder(
+            locale.getpreferredencoding(False)
+        )(errors="replace")
+        self._output_carry = ""
+        self._flush_timer.start()
         self.solver_worker.start()
 
     def append_output(self, text: str):
-        """Append a line of output to the output area."""
-        self.output_edit.moveCursor(self.output_edit.textCursor().End)
-        self.output_edit.insertPlainText(text)
-        self.output_edit.ensureCursorVisible()
+        """Queue output text; it is written to the output area on the next flush."""
+        self._pending_output.append(text)
+        if not self._flush_timer.isActive():
+            self._flush_output()
+
+    def _flush_output(self):
+        """Drain the solver queue and write all pending output in one insert."""
+        finished = False
+        worker = self.solver_worker
+        if worker is not None:
+            out_queue = worker.output_queue
+            raw: List[bytes] = []
+            while True:
+                try:
+                    chunk = out_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if chunk is None:
+                    finished = True
+                    break
+                if isinstance(chunk, bytes):
+                    raw.append(chunk)
+                    continue
+                if raw:
+                    self._pending_output.append(self._decode_output(b"".join(raw)))
+                    raw.clear()
+                self._pending_output.append(chunk)
+            if raw or finished:
+                self._pending_output.append(self._decode_output(b"".join(raw), final=finished))
+        if self._pending_output:
+            joined = "".join(self._pending_output)
+            self._pending_output.clear()
+            self.output_edit.moveCursor(self.output_edit.textCursor().End)
+            self.output_edit.insertPlainText(joined)
+            self.output_edit.ensureCursorVisible()
+        if finished:
+            self.on_solver_finished()
+
+    def _decode_output(self, data: bytes, final: bool = False) -> str:
+        """Decode a batch of raw solver output, normalising Windows newlines."""
+        text = self._output_carry + self._output_decoder.decode(data, final)
+        # \r\n 可能被拆在两批之间，末尾的 \r 留到下一批再处理
+        if not final and text.endswith("\r"):
+            self._output_carry = "\r"
+            text = text[:-1]
+        else:
+            self._output_carry = ""
+        return text.replace("\r\n", "\n")
 
     def on_solver_finished(self):
         """Clean up after the solver finishes and display results."""
+        self._flush_timer.stop()
+        self.solver_worker = None
         self.loading_label.hide()
-        self.loading_movie.stop()
         self.solve_button.setEnabled(True)
-        logs_dir = app_logs_dir()
         try:
-            files = [
-                os.path.join(logs_dir, f)
-                for f in os.listdir(logs_dir)
-                if f.endswith(".log")
-            ]
-            if files:
-                latest = max(files, key=os.path.getmtime)
-                combos = parse_log_file(latest)
-                if combos:
-                    self.last_result_combos = combos
-                    self.result_window = ResultWindow(combos, self)
-                    self.result_window.show()
+            latest = self._solver_log_path
+            try:
+                st = os.stat(latest) if latest else None
+            except OSError:
+                st = None
+            if st is None:
+                # 求解器没有写到指定文件（例如日志已由外部配置）时退回扫描目录
+                entry = _latest_log(self._logs_dir)
+                if entry is not None:
+                    latest, st = entry.path, entry.stat()
+            if st is not None:
+                key = (latest, st.st_mtime_ns, st.st_size)
+                if key == self._parsed_log_key:
+                    if self.last_result_combos:
+                        self._show_result_window(self.last_result_combos)
+                else:
+                    # 解析放到线程池，完成后在 _on_log_parsed 中显示
+                    self._parse_generation += 1
+                    task = _ParseTask(key, self._parse_generation)
+                    task.signals.finished.connect(self._on_log_parsed)
+                    task.signals.failed.connect(self._on_log_parse_failed)
+                    self._parse_task = task
+                    QThreadPool.globalInstance().start(task)
         except Exception as e:
             self.append_output(f"解析日志失败: {e}\n")
         self.refresh_log_list()
 
+    def _on_log_parsed(self, generation: int, key: tuple, combos: List[dict]) -> None:
+        """Show the combos parsed by the current :class:`_ParseTask`."""
+        if generation != self._parse_generation:
+            return
+        self._parse_task = None
+        self._parsed_log_key = key
+        if combos:
+            self.last_result_combos = combos
+            self._show_result_window(combos)
+
+    def _on_log_parse_failed(self, generation: int, message: str) -> None:
+        if generation != self._parse_generation:
+            return
+        self._parse_task = None
+        self.append_output(f"解析日志失败: {message}\n")
+
     def show_output_window(self):
         """Open a new resizable window to display the full output text."""
-        text = self.output_edit.toPlainText()
-        window = OutputWindow(text, self)
-        window.show()
+        doc = self.output_edit.document()
+        if self._output_window is None:
+            self._output_window = OutputWindow(doc, self)
+        else:
+            self._output_window.set_document(doc)
+        self._output_window.show()
+        self._output_window.raise_()
 
     def show_collect_window(self):
         """Open a window displaying all collected combos."""
-        collect_dir = app_collect_dir()
-        combos: List[dict] = []
-        if os.path.isdir(collect_dir):
-            for name in os.listdir(collect_dir):
-                if name.endswith(".json"):
-                    path = os.path.join(collect_dir, name)
-                    try:
-                        with open(path, "r", encoding="utf-8") as f:
-                            combos.append(json.load(f))
-                    except Exception:
-                        pass
+        if self._collect_task is not None:
+            return
+        # 读取放到线程池，完成后在 _on_collect_loaded 中显示
+        task = _CollectLoadTask(app_collect_dir())
+        task.signals.loaded.connect(self._on_collect_loaded)
+        task.signals.failed.connect(self._on_collect_load_failed)
+        self._collect_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_collect_loaded(self, collect_dir: str, combos: List[dict]) -> None:
+        """Show the combos read by a :class:`_CollectLoadTask`."""
+        self._collect_task = None
         if combos:
-            self.collect_window = ResultWindow(combos, self, title="收藏夹")
+            if self.collect_window is None:
+                self.collect_window = ResultWindow(combos, self, title="收藏夹")
+            else:
+                self.collect_window.set_combos(combos)
             self.collect_window.show()
+            self.collect_window.raise_()
+
+    def _on_collect_load_failed(self, message: str) -> None:
+        self._collect_task = None
+        self.append_output(f"读取收藏夹失败: {message}\n")
 
     def show_last_result_window(self) -> None:
         """Reopen the last solver result window if results are available."""
         if self.last_result_combos:
-            self.result_window = ResultWindow(self.last_result_combos, self)
-            self.result_window.show()
+            self._show_result_window(self.last_result_combos)
         else:
             self.append_output("暂无结果，请先运行求解。\n")
 
+    def _show_result_window(self, combos: List[dict]) -> None:
+        """Show *combos* in the result window, creating it on first use."""
+        if self.result_window is None:
+            self.result_window = ResultWindow(combos, self)
+        elif self.result_window.combos is not combos:
+            self.result_window.set_combos(combos)
+        self.result_window.show()
+        self.result_window.raise_()
+
+
+def _apply_window_mode(window: QMainWindow) -> None:
+    """Make a child window frameless and translucent unless :data:`OPAQUE_UI` is set."""
+    if OPAQUE_UI:
+        return
+    window.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
+    window.setAttribute(Qt.WA_TranslucentBackground)
+
 
 class ResultWindow(QMainWindow):
-    """Display parsed solver results in a scrollable grid layout."""
+    """Display parsed solver results as a scrollable two-column list of cards."""
 
     def __init__(
         self,
@@ -793,8 +1454,7 @@ class ResultWindow(QMainWindow):
         title: str = "搭配结果",
     ):
         super().__init__(parent)
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
-        self.setAttribute(Qt.WA_TranslucentBackground)
+        _apply_window_mode(self)
         self.resize(1637, 1088)
         central = QWidget()
         central.setObjectName("resultWindowCentral")
@@ -802,103 +1462,189 @@ class ResultWindow(QMainWindow):
         outer.setContentsMargins(10, 10, 10, 10)
         outer.setSpacing(5)
         central.setLayout(outer)
-        central.setStyleSheet(
-            "#resultWindowCentral { background-color: rgba(0, 0, 0, 0.8); border-radius: 8px; }"
-        )
         self.title_bar = CustomTitleBar(self)
         self.title_bar.title_label.setText(title)
         outer.addWidget(self.title_bar)
         self.collect_dir = app_collect_dir()
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("border: none;")
-        container = QWidget()
-        grid = QGridLayout()
-        grid.setContentsMargins(10, 10, 10, 10)
-        grid.setSpacing(10)
-        container.setLayout(grid)
-        for i, combo in enumerate(combos):
-            frame = QFrame()
-            frame.setStyleSheet(
-                "background-color: rgba(0, 0, 0, 0.7); color: white; border-radius: 5px;"
-            )
-            vbox = QVBoxLayout()
-            vbox.setContentsMargins(10, 10, 10, 10)
-            vbox.setSpacing(8)
-            frame.setLayout(vbox)
-            rank = combo.get("rank", i + 1)
-            top_row = QHBoxLayout()
-            rank_label = QLabel(f"第{rank}名")
-            rank_label.setStyleSheet("font-weight: bold; font-size: 24px;")
-            top_row.addWidget(rank_label)
-            top_row.addStretch(1)
-            combo_hash = hashlib.md5(
-                json.dumps(combo, sort_keys=True, ensure_ascii=False).encode("utf-8")
-            ).hexdigest()
-            collect_path = os.path.join(self.collect_dir, f"{combo_hash}.json")
-            star_button = QPushButton("☆")
-            star_button.setFixedSize(48, 48)
-            star_button.setStyleSheet(
-                "QPushButton { border: none; background: transparent; color: white; font-size: 28px; }"
-            )
-            if os.path.exists(collect_path):
-                star_button.setText("★")
-                star_button.setStyleSheet(
-                    "QPushButton { border: none; background: transparent; color: yellow; font-size: 28px; }"
-                )
-            star_button.clicked.connect(
-                lambda _, path=collect_path, combo=combo, btn=star_button: self.toggle_collect(path, combo, btn)
-            )
-            top_row.addWidget(star_button)
-            vbox.addLayout(top_row)
-            lines: List[str] = []
-            if combo.get("total"):
-                lines.append(combo["total"])
-            if combo.get("power"):
-                lines.append(combo["power"])
-            if combo.get("modules"):
-                lines.append("模组列表:")
-                lines.extend(combo["modules"])
-            if combo.get("attrs"):
-                lines.append("属性分布:")
-                lines.extend(combo["attrs"])
-            label = QLabel("\n".join(lines))
-            label.setWordWrap(True)
-            label.setTextInteractionFlags(Qt.TextSelectableByMouse)
-            label.setStyleSheet("font-size: 22px;")
-            vbox.addWidget(label)
-            grid.addWidget(frame, i // 2, i % 2)
-        scroll.setWidget(container)
-        outer.addWidget(scroll)
-        outer.setStretchFactor(scroll, 1)
+        self.combos: List[dict] = []
+        self._collect_paths: List[str] = []
+        # 收藏目录中已有的搭配哈希，set_combos 时扫描一次，收藏/取消时同步更新
+        self._collected: set[str] = set()
+        # 正在后台写入/删除收藏文件的搭配哈希，完成前忽略重复点击
+        self._collect_pending: set[str] = set()
+        self._collect_tasks: List[_CollectWriteTask] = []
+        # 已渲染的搭配数量，其余的在滚动到底部附近（或内容不足一屏）时分批追加
+        self._rendered = 0
+        self._filling = False
+        # 所有搭配渲染进同一个 QTextBrowser，收藏星标是 collect:<序号> 链接
+        self.browser = QTextBrowser()
+        self.browser.setObjectName("resultBrowser")
+        self.browser.setOpenLinks(False)
+        self.browser.document().setDefaultStyleSheet(RESULT_CARD_CSS)
+        self.browser.anchorClicked.connect(self._on_anchor_clicked)
+        scroll_bar = self.browser.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self._maybe_render_more)
+        # 内容或窗口大小变化后滚动范围可能仍不足一屏，此时不会再有滚动信号
+        scroll_bar.rangeChanged.connect(self._on_scroll_range_changed)
+        self.set_combos(combos)
+        outer.addWidget(self.browser)
+        outer.setStretchFactor(self.browser, 1)
         self.setCentralWidget(central)
         #self.setStyleSheet("* { font-size: 22px; }")
 
-    def toggle_collect(self, path: str, combo: dict, button: QPushButton) -> None:
-        """Toggle collection state for a combo and update button appearance."""
-        if os.path.exists(path):
-            os.remove(path)
-            button.setText("☆")
-            button.setStyleSheet(
-                "QPushButton { border: none; background: transparent; color: white; font-size: 28px;}"
-            )
+    def set_combos(self, combos: List[dict]) -> None:
+        """Replace the displayed combos and re-render from the top."""
+        self.combos = combos
+        self._rendered = 0
+        collect_dir = self.collect_dir
+        self._collect_paths = [
+            os.path.join(collect_dir, f"{_combo_key(combo)}.json") for combo in combos
+        ]
+        self._collected = _collected_keys(collect_dir)
+        self._render()
+        self.browser.verticalScrollBar().setValue(0)
+
+    def _card_html(self, i: int, combo: dict) -> str:
+        """Return the table cell markup for a single combo."""
+        rank = combo.get("rank", i + 1)
+        if _combo_key(combo) in self._collected:
+            star = "<a class='star-on' href='collect:%d'>★</a>" % i
         else:
-            os.makedirs(self.collect_dir, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(combo, f, ensure_ascii=False, indent=2)
-            button.setText("★")
-            button.setStyleSheet(
-                "QPushButton { border: none; background: transparent; color: yellow; font-size: 28px;}"
-            )
+            star = "<a class='star' href='collect:%d'>☆</a>" % i
+        # 解析/读取收藏的线程已预先拼好文本，缺少时才现场生成。
+        # 转义后的正文缓存在搭配上，收藏切换引起的重绘不再重复转义
+        body = combo.get("_html")
+        if body is None:
+            rendered = combo.get("rendered")
+            if rendered is None:
+                rendered = render_combo_text(combo)
+            body = combo["_html"] = html.escape(rendered).replace("\n", "<br>")
+        return (
+            "<td class='card' width='50%' valign='top'>"
+            f"<table width='100%'><tr><td class='rank'>第{rank}名</td>"
+            f"<td align='right'>{star}</td></tr></table>"
+            f"<p class='lines'>{body}</p></td>"
+        )
+
+    def _table_html(self, start: int, stop: int) -> str:
+        """Return a two-column table holding the cards for ``combos[start:stop]``."""
+        cells = [self._card_html(i, self.combos[i]) for i in range(start, stop)]
+        if len(cells) % 2:
+            cells.append("<td width='50%'></td>")
+        rows = ["<tr>" + cells[i] + cells[i + 1] + "</tr>" for i in range(0, len(cells), 2)]
+        return "<table width='100%' cellspacing='10' cellpadding='10'>" + "".join(rows) + "</table>"
+
+    def _render(self) -> None:
+        """Re-render the cards shown so far (at least the first batch) in one setHtml call."""
+        scroll_bar = self.browser.verticalScrollBar()
+        scroll = scroll_bar.value()
+        self._rendered = min(len(self.combos), max(self._rendered, RESULT_BATCH_SIZE))
+        # 替换内容和恢复滚动位置期间不重绘，只在最后刷新一次
+        self.browser.setUpdatesEnabled(False)
+        try:
+            self.browser.setHtml(self._table_html(0, self._rendered))
+            scroll_bar.setValue(scroll)
+        finally:
+            self.browser.setUpdatesEnabled(True)
+        self._fill_view()
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._fill_view()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._fill_view()
+
+    def _maybe_render_more(self, value: int) -> None:
+        self._fill_view()
+
+    def _on_scroll_range_changed(self, minimum: int, maximum: int) -> None:
+        self._fill_view()
+
+    def _fill_view(self) -> None:
+        """Append batches of cards while the view is at (or near) the bottom.
+
+        This also covers content that does not fill the viewport yet, where
+        the scroll bar cannot move and would never request the next batch.
+        """
+        if self._filling or not self.browser.isVisible():
+            return
+        scroll_bar = self.browser.verticalScrollBar()
+        self._filling = True
+        try:
+            while (
+                self._rendered < len(self.combos)
+                and scroll_bar.value() >= scroll_bar.maximum() - scroll_bar.pageStep()
+            ):
+                self._append_batch()
+        finally:
+            self._filling = False
+
+    def _append_batch(self) -> None:
+        """Append the next :data:`RESULT_BATCH_SIZE` cards to the end of the view."""
+        start = self._rendered
+        stop = min(len(self.combos), start + RESULT_BATCH_SIZE)
+        # 先更新计数，插入内容引起的滚动信号不会重复追加
+        self._rendered = stop
+        self.browser.setUpdatesEnabled(False)
+        try:
+            cursor = QTextCursor(self.browser.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertHtml(self._table_html(start, stop))
+        finally:
+            self.browser.setUpdatesEnabled(True)
+
+    def _on_anchor_clicked(self, url) -> None:
+        """Handle a click on a combo's collect star."""
+        if url.scheme() != "collect":
+            return
+        try:
+            index = int(url.path())
+        except ValueError:
+            return
+        if 0 <= index < len(self.combos):
+            self.toggle_collect(self._collect_paths[index], self.combos[index])
+
+    def toggle_collect(self, path: str, combo: dict) -> None:
+        """Toggle collection state for a combo.
+
+        The star is updated right away; the file is written or removed in
+        the thread pool and the star is reverted if that fails.
+        """
+        key = _combo_key(combo)
+        if key in self._collect_pending:
+            return
+        remove = key in self._collected
+        if remove:
+            self._collected.discard(key)
+        else:
+            self._collected.add(key)
+        self._collect_pending.add(key)
+        task = _CollectWriteTask(key, path, None if remove else _combo_payload(combo))
+        task.signals.done.connect(self._on_collect_written)
+        self._collect_tasks.append(task)
+        QThreadPool.globalInstance().start(task)
+        self._render()
+
+    def _on_collect_written(self, key: str, ok: bool) -> None:
+        """Finish a :class:`_CollectWriteTask`, undoing the star change on failure."""
+        self._collect_pending.discard(key)
+        self._collect_tasks = [t for t in self._collect_tasks if t.key != key]
+        if not ok:
+            if key in self._collected:
+                self._collected.discard(key)
+            else:
+                self._collected.add(key)
+            self._render()
 
 
 
 class OutputWindow(QMainWindow):
 
-    def __init__(self, text: str, parent: QWidget | None = None):
+    def __init__(self, source_doc: QTextDocument, parent: QWidget | None = None):
         super().__init__(parent)
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Window)
-        self.setAttribute(Qt.WA_TranslucentBackground)
+        _apply_window_mode(self)
         # Set fixed size as requested
         self.resize(1637, 1088)
         # Central widget with dark translucent background
@@ -908,45 +1654,63 @@ class OutputWindow(QMainWindow):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(5)
         central.setLayout(layout)
-        central.setStyleSheet(
-            "#outputWindowCentral { background-color: rgba(0, 0, 0, 0.8); border-radius: 8px; }"
-        )
         # Title bar
         self.title_bar = CustomTitleBar(self)
         # Override the title text
         self.title_bar.title_label.setText("输出查看")
         layout.addWidget(self.title_bar)
         # Text area
-        self.text_edit = QTextEdit()
+        self.text_edit = QPlainTextEdit()
+        self.text_edit.setObjectName("outputText")
         self.text_edit.setReadOnly(True)
-        self.text_edit.setStyleSheet(
-            "background-color: rgba(0, 0, 0, 0.7);"
-            "color: white;"
-            "border: none;"
-            "padding: 5px;"
-        )
-        self.text_edit.setPlainText(text)
+        self.text_edit.setMaximumBlockCount(OUTPUT_WINDOW_MAX_BLOCKS)
         layout.addWidget(self.text_edit)
         layout.setStretchFactor(self.text_edit, 1)
         self.setCentralWidget(central)
+        # 当前显示的文档副本；控件自带的默认文档由 setDocument 自行删除
+        self._doc: QTextDocument | None = None
+        self.set_document(source_doc)
+
+    def set_document(self, source_doc: QTextDocument) -> None:
+        """Show a snapshot of *source_doc* without going through a Python str."""
+        doc = source_doc.clone(self)
+        doc.setDocumentLayout(QPlainTextDocumentLayout(doc))
+        doc.setUndoRedoEnabled(False)
+        self.text_edit.setDocument(doc)
+        self.text_edit.setMaximumBlockCount(OUTPUT_WINDOW_MAX_BLOCKS)
+        # 只删除本窗口自己克隆的上一份副本
+        if self._doc is not None:
+            self._doc.deleteLater()
+        self._doc = doc
 
 
 def main():
     app = QApplication(sys.argv)
     # Use a dark palette to better contrast against the background image
     palette = QPalette()
-    palette.setColor(QPalette.Window, QColor(0, 0, 0, 0))
-    palette.setColor(QPalette.WindowText, QColor(255, 255, 255))
-    palette.setColor(QPalette.Base, QColor(0, 0, 0, 150))
-    palette.setColor(QPalette.AlternateBase, QColor(0, 0, 0, 100))
-    palette.setColor(QPalette.ToolTipBase, QColor(255, 255, 255))
-    palette.setColor(QPalette.ToolTipText, QColor(255, 255, 255))
-    palette.setColor(QPalette.Text, QColor(255, 255, 255))
-    palette.setColor(QPalette.Button, QColor(0, 0, 0, 150))
-    palette.setColor(QPalette.ButtonText, QColor(255, 255, 255))
-    palette.setColor(QPalette.Highlight, QColor(0, 120, 215, 180))
-    palette.setColor(QPalette.HighlightedText, QColor(255, 255, 255))
+    palette.setColor(QPalette.Window, _COLORS["transparent"])
+    palette.setColor(QPalette.WindowText, _COLORS["white"])
+    palette.setColor(QPalette.Base, _COLORS["base"])
+    palette.setColor(QPalette.AlternateBase, _COLORS["alternate_base"])
+    palette.setColor(QPalette.ToolTipBase, _COLORS["white"])
+    palette.setColor(QPalette.ToolTipText, _COLORS["white"])
+    palette.setColor(QPalette.Text, _COLORS["white"])
+    palette.setColor(QPalette.Button, _COLORS["base"])
+    palette.setColor(QPalette.ButtonText, _COLORS["white"])
+    palette.setColor(QPalette.Highlight, _COLORS["highlight"])
+    palette.setColor(QPalette.HighlightedText, _COLORS["white"])
     app.setPalette(palette)
+    # 结果/输出窗口的样式统一在此设置，按 objectName 匹配
+    if OPAQUE_UI:
+        window_bg = "background-color: #121212;"
+    else:
+        window_bg = "background-color: rgba(0, 0, 0, 0.8); border-radius: 8px;"
+    app.setStyleSheet(
+        f"#resultWindowCentral, #outputWindowCentral {{ {window_bg} }}"
+        "QTextBrowser#resultBrowser { background: transparent; border: none; }"
+        "QPlainTextEdit#outputText {"
+        " background-color: rgba(0, 0, 0, 0.7); color: white; border: none; padding: 5px; }"
+    )
     window = StarRailwayGUI()
     window.show()
     sys.exit(app.exec_())
@@ -2,38 +2,122 @@
 日志配置
 """
 
+import atexit
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import sys
+import threading
+import time
+
+# 启动方（如图形界面）可通过该环境变量指定本次运行的日志文件
+LOG_FILE_ENV = "SR_LOG_FILE"
+# 未指定日志文件时，可通过该环境变量指定日志目录（默认为当前目录下的 logs）
+LOG_DIR_ENV = "STAR_RESONANCE_LOG_DIR"
+
+# 日志文件写缓冲大小
+LOG_BUFFER_SIZE = 64 * 1024
+
+# 原样写入日志文件的记录（如搭配结果）使用的日志器名称
+RAW_LOGGER_NAME = "raw"
+
+# setup_logging 配置的日志文件路径，未配置时为 None
+_log_file = None
+# 写文件的处理器与转发队列记录的监听线程，未配置时为 None
+_file_handler = None
+_listener = None
+# 保证多线程同时调用 setup_logging 时只配置一次
+_setup_lock = threading.Lock()
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    带写缓冲的文件处理器
+    
+    普通记录只写入缓冲区，累计满 ``buffer_size`` 或遇到 ``flush_level`` 及以上级别的记录时才写盘；
+    显式调用 ``flush()`` 以及关闭时（``logging.shutdown`` 会在退出时调用）写出全部缓冲内容。
+    """
+
+    def __init__(self, filename, mode='a', encoding=None, delay=False,
+                 buffer_size=LOG_BUFFER_SIZE, flush_level=logging.ERROR):
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self._defer_flush = False
+        super().__init__(filename, mode, encoding, delay)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+
+    def emit(self, record):
+        # emit 在处理器锁内调用，标志位不会被其他线程打断
+        self._defer_flush = record.levelno < self.flush_level
+        try:
+            super().emit(record)
+        finally:
+            self._defer_flush = False
+
+    def flush(self):
+        if not self._defer_flush:
+            super().flush()
+
+
+class _LogFormatter(logging.Formatter):
+    """带 ``raw`` 标记的记录只输出消息本身，其余按常规格式输出"""
+
+    def format(self, record):
+        if getattr(record, "raw", False):
+            return record.getMessage()
+        return super().format(record)
+
+
+def _not_raw(record):
+    return not getattr(record, "raw", False)
 
 
 def setup_logging(level=logging.INFO, debug_mode=False):
     """
     日志配置
     
+    控制台在调用线程中同步输出，与程序自身的 print 保持先后顺序；
+    写文件经 QueueHandler 入队，由后台 QueueListener 线程完成。
+    已配置过时，若 :data:`LOG_FILE_ENV` 指定了另一个文件（如界面在同一进程内再次求解），
+    只把文件处理器切换到新文件。
+    
     Args:
         level: 日志级别
         debug_mode: 是否为调试模式
     """
-    # 如果已经配置过，直接返回
-    if logging.getLogger().handlers:
-        return
-    
+    with _setup_lock:
+        if _log_file is not None:
+            log_file = os.environ.get(LOG_FILE_ENV)
+            if log_file and log_file != _log_file:
+                _switch_log_file(log_file)
+            return
+        # 如果已经有文件日志，直接返回；其他处理器（如测试框架或界面转发）不影响配置
+        if any(isinstance(h, logging.FileHandler) for h in logging.getLogger().handlers):
+            return
+        _setup_logging(level, debug_mode)
+
+
+def _setup_logging(level, debug_mode):
     # 设置日志级别
     if debug_mode:
         level = logging.DEBUG
     
-    # 创建日志目录
-    log_dir = "logs"
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-    
-    # 生成日志文件名（包含时间戳）
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(log_dir, f"star_resonance_{timestamp}.log")
+    # 生成日志文件名（包含时间戳）；启动方已指定文件时其目录由启动方负责创建
+    log_file = os.environ.get(LOG_FILE_ENV)
+    if not log_file:
+        # 创建日志目录
+        log_dir = os.environ.get(LOG_DIR_ENV) or "logs"
+        if not os.path.isdir(log_dir):
+            os.makedirs(log_dir, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        log_file = os.path.join(log_dir, f"star_resonance_{timestamp}.log")
     
     # 配置日志格式
-    formatter = logging.Formatter(
+    formatter = _LogFormatter(
         '[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
@@ -42,17 +126,43 @@ def setup_logging(level=logging.INFO, debug_mode=False):
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
+    # 原样记录由调用方自行 print，控制台不再重复输出
+    console_handler.addFilter(_not_raw)
     
     # 文件处理器
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler = BufferedFileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
     
-    # 配置根日志器
+    # 配置根日志器：控制台同步输出；文件记录入队即返回，由监听线程按顺序写出
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    # 先于 logging 自身的退出清理执行，保证队列中的记录全部写出
+    atexit.register(listener.stop)
+    
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
     root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    global _log_file, _file_handler, _listener
+    _log_file = log_file
+    _file_handler = file_handler
+    _listener = listener
+    
+    # 未捕获的异常写入日志；ERROR 级别会立即冲刷文件缓冲，崩溃信息不会丢失
+    # 根日志器的 error 方法在配置时绑定一次，以默认参数传入
+    def _handle_exception(exc_type, exc_value, exc_traceback,
+                          _error=root_logger.error, _default_hook=sys.__excepthook__):
+        if issubclass(exc_type, KeyboardInterrupt):
+            _default_hook(exc_type, exc_value, exc_traceback)
+            return
+        _error("未捕获的异常", exc_info=(exc_type, exc_value, exc_traceback))
+    
+    sys.excepthook = _handle_exception
     
     # 记录日志配置信息
     logger = logging.getLogger(__name__)
@@ -60,6 +170,65 @@ def setup_logging(level=logging.INFO, debug_mode=False):
     logger.info(f"日志文件: {log_file}")
 
 
+def _switch_log_file(log_file):
+    """把文件处理器切换到 *log_file*，此前入队的记录仍写入原文件"""
+    global _log_file
+    _drain_queue()
+    handler = _file_handler
+    handler.acquire()
+    try:
+        old_stream = handler.stream
+        handler.baseFilename = os.path.abspath(log_file)
+        handler.stream = handler._open()
+    finally:
+        handler.release()
+    if old_stream is not None:
+        old_stream.close()
+    _log_file = log_file
+    logging.getLogger(__name__).info(f"日志文件: {log_file}")
+
+
+def _drain_queue():
+    # 停止监听线程会先处理完队列中已有的记录，随后重新启动
+    if _listener is not None:
+        _listener.stop()
+        _listener.start()
+
+
+def flush_logging():
+    """
+    写出队列和文件缓冲中的全部日志记录
+    
+    在同一进程内运行完一次求解、需要立即读取日志文件时调用。
+    """
+    with _setup_lock:
+        _drain_queue()
+        if _file_handler is not None:
+            _file_handler.flush()
+
+
+def get_log_file():
+    """
+    获取 setup_logging 配置的日志文件路径
+    
+    Returns:
+        日志文件路径，未配置时返回 None
+    """
+    return _log_file
+
+
+def log_raw(message):
+    """
+    将消息原样（不带时间、级别等前缀）写入日志文件
+    
+    与普通日志记录经同一队列写出，因此在文件中的先后顺序与调用顺序一致。
+    
+    Args:
+        message: 要写入的消息
+    """
+    logging.getLogger(RAW_LOGGER_NAME).info(message, extra={"raw": True})
+
+
 def get_logger(name):
     """
     获取指定名称的日志器
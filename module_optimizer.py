@@ -10,7 +10,7 @@ import multiprocessing as mp
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from itertools import combinations
-from logging_config import get_logger
+from logging_config import get_logger, get_log_file, log_raw
 import psutil
 from module_types import (
     ModuleInfo, ModuleType, ModulePart, ModuleAttrType, ModuleCategory,
@@ -99,6 +99,9 @@ class ModuleOptimizer:
             Exception: 获取日志文件路径时可能出现的异常
         """
         try:
+            log_file = get_log_file()
+            if log_file:
+                return log_file
             root_logger = logging.getLogger()
             for handler in root_logger.handlers:
                 if isinstance(handler, logging.FileHandler):
@@ -121,7 +124,10 @@ class ModuleOptimizer:
             if self._result_log_file is None:
                 self._result_log_file = self._get_current_log_file()
             
-            if self._result_log_file and os.path.exists(self._result_log_file):
+            if self._result_log_file and self._result_log_file == get_log_file():
+                # 与其他日志经同一队列写出，保证结果在文件中的顺序
+                log_raw(message)
+            elif self._result_log_file and os.path.exists(self._result_log_file):
                 with open(self._result_log_file, 'a', encoding='utf-8') as f:
                     f.write(message + '\n')
         except Exception as e:
@@ -15,29 +15,40 @@ from __future__ import annotations
 import argparse
 import base64
 import json
+import logging
+import mmap
+import re
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import TYPE_CHECKING, List, Optional, Dict
 
-from google.protobuf.json_format import Parse as JsonParse
-from google.protobuf.message import DecodeError
-
-# 项目内模块
-from BlueProtobuf_pb2 import CharSerialize, SyncContainerData  # type: ignore
+# 项目内模块；protobuf 与解析/优化模块较重，在用到时才导入，--help 与参数错误可立即返回
 from logging_config import setup_logging, get_logger
-from module_parser import ModuleParser
-from module_optimizer import ModuleOptimizer
-from module_types import ModuleCategory
+
+if TYPE_CHECKING:
+    from BlueProtobuf_pb2 import CharSerialize  # type: ignore
 
 logger = get_logger(__name__)
 
 
 # ---------- 读取本地 VData（JSON / base64 / protobuf） ----------
-def load_vdata_from_file(path: str | Path) -> CharSerialize:
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"文件不存在: {p}")
+_BASE64_RE = re.compile(rb"\s*([A-Za-z0-9+/]+={0,2})\s*")
+_NON_SPACE_RE = re.compile(rb"\S")
+_UTF8_BOM = b"\xef\xbb\xbf"
+# 小于该大小的文件直接读入内存，更大的文件用 mmap 映射，避免整份复制
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def _text_bytes(data) -> bytes:
+    """去掉首尾空白与 UTF-8 BOM 后的文本字节（仅 base64 / JSON 分支需要）"""
+    text = bytes(data).strip()
+    if text.startswith(_UTF8_BOM):
+        text = text[len(_UTF8_BOM):].lstrip()
+    return text
 
-    data = p.read_bytes()
+
+def _load_binary(data) -> Optional[CharSerialize]:
+    from google.protobuf.message import DecodeError
+    from BlueProtobuf_pb2 import CharSerialize, SyncContainerData  # type: ignore
 
     # 1) 尝试解析为 SyncContainerData（二进制）
     try:
@@ -54,33 +65,37 @@ def load_vdata_from_file(path: str | Path) -> CharSerialize:
         cs.ParseFromString(data)
         return cs
     except DecodeError:
-        pass
+        return None
 
-    # 3) 文本：尝试 base64 / JSON
-    try:
-        text = data.decode("utf-8").strip()
-    except UnicodeDecodeError:
-        raise ValueError("无法解析：既不是 protobuf 二进制，也不是 UTF-8 文本(JSON/base64)") from None
 
-    # 3a) 仅 base64（假设为 CharSerialize 原始字节）
+def _load_base64(data) -> Optional[CharSerialize]:
+    from BlueProtobuf_pb2 import CharSerialize  # type: ignore
+
+    # 仅 base64（假设为 CharSerialize 原始字节）
     try:
-        raw = base64.b64decode(text, validate=True)
+        raw = base64.b64decode(_text_bytes(data), validate=True)
         cs = CharSerialize()
         cs.ParseFromString(raw)
         return cs
     except Exception:
-        pass
+        return None
+
+
+def _load_json(data) -> Optional[CharSerialize]:
+    from google.protobuf.json_format import ParseDict as JsonParseDict
+    from BlueProtobuf_pb2 import CharSerialize, SyncContainerData  # type: ignore
 
-    # 3b) JSON：既支持顶层 CharSerialize，也支持顶层 SyncContainerData(VData内嵌)
+    # JSON：既支持顶层 CharSerialize，也支持顶层 SyncContainerData(VData内嵌)
+    # 文本只解析一次，两种消息类型都直接从解析出的 dict 填充
     try:
-        obj = json.loads(text)
-    except json.JSONDecodeError as e:
-        raise ValueError(f"不是有效的 JSON / base64 / protobuf：{e}") from None
+        obj = json.loads(_text_bytes(data).decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
 
     # 顶层 CharSerialize JSON
     try:
         cs = CharSerialize()
-        JsonParse(json.dumps(obj), cs)
+        JsonParseDict(obj, cs)
         return cs
     except Exception:
         pass
@@ -88,21 +103,76 @@ def load_vdata_from_file(path: str | Path) -> CharSerialize:
     # 顶层 SyncContainerData JSON
     try:
         scd = SyncContainerData()
-        JsonParse(json.dumps(obj), scd)
+        JsonParseDict(obj, scd)
         if scd.HasField("VData"):
             return scd.VData
     except Exception:
         pass
+    return None
+
+
+def _content_start(data) -> int:
+    return len(_UTF8_BOM) if data[:len(_UTF8_BOM)] == _UTF8_BOM else 0
+
+
+def _looks_json(data) -> bool:
+    m = _NON_SPACE_RE.search(data, _content_start(data))
+    return m is not None and data[m.start()] in b"{["
+
+
+def _looks_base64(data) -> bool:
+    m = _BASE64_RE.fullmatch(data, _content_start(data))
+    return m is not None and (m.end(1) - m.start(1)) % 4 == 0
+
+
+# (内容特征判断, 加载函数)；判断为 None 表示兜底格式，总是排在未命中的格式之前
+_VDATA_LOADERS = (
+    (_looks_json, _load_json),
+    (_looks_base64, _load_base64),
+    (None, _load_binary),
+)
+
+
+def load_vdata_from_file(path: str | Path) -> CharSerialize:
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"文件不存在: {p}")
+
+    if p.stat().st_size < _MMAP_MIN_SIZE:
+        return _load_vdata(p.read_bytes())
+    # 大文件映射到内存，二进制解析直接读取映射页面
+    with open(p, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return _load_vdata(view)
+
+
+def _load_vdata(data) -> CharSerialize:
+    # 先尝试内容特征相符的格式，只在判断失误时才依次尝试其余格式
+    matched = []
+    others = []
+    for looks_like, loader in _VDATA_LOADERS:
+        (matched if looks_like is None or looks_like(data) else others).append(loader)
+
+    for loader in matched + others:
+        vdata = loader(data)
+        if vdata is not None:
+            return vdata
 
     raise ValueError("无法识别 CharSerialize/SyncContainerData（支持：二进制pb / JSON / base64）。")
 
 
 # ---------- 主流程：解析 -> 优化 -> 输出 ----------
+# 可选的模组类型，即 ModuleCategory 各成员的值（module_types 延迟导入，这里只记值）
+_CATEGORIES = ("攻击", "守护", "辅助", "全部")
+
+
 def main(argv: Optional[List[str]] = None) -> int:
-    ap = argparse.ArgumentParser(description="从本地 VData 读取并输出 TopN 模组组合（替代抓包）")
+    ap = argparse.ArgumentParser(
+        description="从本地 VData 读取并输出 TopN 模组组合（替代抓包）", allow_abbrev=False
+    )
     ap.add_argument("--vdata", required=True, help="VData 文件路径（.pb/.bin 或 JSON/base64）")
     ap.add_argument("--debug", "-d", action="store_true", help="启用调试日志")
-    ap.add_argument("--category", "-c", type=str, choices=["攻击", "守护", "辅助", "全部"], default="全部", help="目标模组类型")
+    ap.add_argument("--category", "-c", type=str, choices=_CATEGORIES, default="全部", help="目标模组类型")
     ap.add_argument("--attributes", "-attr", nargs="+", help="包含的属性词条（可多选）")
     ap.add_argument("--exclude-attributes", "-exattr", nargs="+", help="排除的属性词条（可多选）")
     ap.add_argument("--match-count", "-mc", type=int, default=1, help="要求至少包含的指定词条数量")
@@ -126,21 +196,27 @@ def main(argv: Optional[List[str]] = None) -> int:
             try:
                 min_attr_sum[name] = int(val)
             except Exception:
-                logger.warning(f"无效的 -mas 阈值：{name} {val}（应为整数）")
-    if min_attr_sum:
-        logger.info("硬性约束（总和 ≥）： " + ", ".join(f"{k}≥{v}" for k, v in min_attr_sum.items()))
-
-    logger.info("=== 本地 VData 读取模式（不抓包）===")
-    logger.info(f"VData: {args.vdata}")
-    if args.attributes:
-        logger.info(f"包含词条: {' '.join(args.attributes)}；至少命中: {args.match_count}")
-    if args.exclude_attributes:
-        logger.info(f"排除词条: {' '.join(args.exclude_attributes)}")
-    logger.info(f"类型: {args.category}；TopN: {args.topn}；枚举: {args.enumeration_mode}")
+                logger.warning("无效的 -mas 阈值：%s %s（应为整数）", name, val)
+    # 参数摘要只在 INFO 可输出时才拼接
+    if logger.isEnabledFor(logging.INFO):
+        if min_attr_sum:
+            logger.info("硬性约束（总和 ≥）： %s", ", ".join(f"{k}≥{v}" for k, v in min_attr_sum.items()))
+
+        logger.info("=== 本地 VData 读取模式（不抓包）===")
+        logger.info("VData: %s", args.vdata)
+        if args.attributes:
+            logger.info("包含词条: %s；至少命中: %d", " ".join(args.attributes), args.match_count)
+        if args.exclude_attributes:
+            logger.info("排除词条: %s", " ".join(args.exclude_attributes))
+        logger.info("类型: %s；TopN: %d；枚举: %s", args.category, args.topn, args.enumeration_mode)
 
     # 1) 读取 VData
     vdata = load_vdata_from_file(args.vdata)
 
+    from module_parser import ModuleParser
+    from module_optimizer import ModuleOptimizer
+    from module_types import ModuleCategory
+
     # 2) 解析模组（使用与 star_railway_monitor 同一套解析器）
     parser = ModuleParser()
     modules = parser.parse_module_info(
@@ -154,13 +230,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     )
 
     # 3) 调用同一 Optimizer 输出 TopN（完全等价于 star_railway_monitor 的展示）
-    category_map = {
-        "攻击": ModuleCategory.ATTACK,
-        "守护": ModuleCategory.GUARDIAN,
-        "辅助": ModuleCategory.SUPPORT,
-        "全部": ModuleCategory.ALL,
-    }
-    target_category = category_map.get(args.category, ModuleCategory.ALL)
+    target_category = ModuleCategory(args.category)
 
     optimizer = ModuleOptimizer(
         target_attributes=args.attributes,